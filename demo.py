@@ -4,8 +4,20 @@ Demo script that generates sample binary data to test the renderer
 """
 
 import struct
+from functools import lru_cache
 import sys
-from typing import List
+from typing import Iterable, List, Tuple
+from utils import write_binary_output
+
+# Precompiled layouts of the fixed-size commands, header included
+_SCREEN_SETUP = struct.Struct('5B')
+_DRAW_CHARACTER = struct.Struct('6B')
+_DRAW_LINE = struct.Struct('8B')
+_TWO_BYTE_COMMAND = struct.Struct('4B')
+
+# Header of a render text command; the text bytes follow it
+_RENDER_TEXT_HEADER = struct.Struct('5B')
+
 
 class BinaryCommandBuilder:
     """Helper class to build binary command streams"""
@@ -15,54 +27,123 @@ class BinaryCommandBuilder:
     
     def add_command(self, command: int, data: List[int]):
         """Add a command with data to the stream"""
-        # Validate that all data values are valid bytes (0-255)
+        # bytes(n) would build n zero bytes, so reject a bare int the way
+        # iterating over it would
+        if isinstance(data, int):
+            raise TypeError(f"'{type(data).__name__}' object is not iterable")
+        
+        # bytes() validates that all values are integers between 0 and 255 in C
+        try:
+            payload = bytes(data)
+        except (TypeError, ValueError):
+            raise self._invalid_data_error(data) from None
+        
+        self.data += bytes((command, len(payload)))
+        self.data += payload
+    
+    def _append_packed(self, layout: struct.Struct, *values):
+        """Append a fixed-layout command (header included) with a single struct call"""
+        try:
+            self.data += layout.pack(*values)
+        except struct.error:
+            raise self._invalid_data_error(values[2:]) from None
+    
+    @staticmethod
+    def _invalid_data_error(data) -> ValueError:
+        """Build the ValueError describing why command data can't be encoded"""
         for value in data:
             if not isinstance(value, int) or value < 0 or value > 255:
-                raise ValueError(f"Data value {value} must be an integer between 0 and 255")
-        
-        self.data.append(command)
-        self.data.append(len(data))
-        self.data.extend(data)
+                return ValueError(f"Data value {value} must be an integer between 0 and 255")
+        return ValueError(f"Command data length {len(data)} must not exceed 255 bytes")
     
     def screen_setup(self, width: int, height: int, color_mode: int):
         """Add screen setup command"""
-        self.add_command(0x1, [width, height, color_mode])
+        self._append_packed(_SCREEN_SETUP, 0x1, 3, width, height, color_mode)
     
     def draw_character(self, x: int, y: int, color: int, char: int):
         """Add draw character command"""
-        self.add_command(0x2, [x, y, color, char])
+        self._append_packed(_DRAW_CHARACTER, 0x2, 4, x, y, color, char)
+    
+    def draw_characters(self, cells: Iterable[Tuple[int, int, int, int]]):
+        """Add a draw character command for every (x, y, color, char) cell in one bulk extend"""
+        cells = list(cells)
+        pack = _DRAW_CHARACTER.pack
+        try:
+            packed = b''.join([pack(0x2, 4, *cell) for cell in cells])
+        except struct.error:
+            # Find the offending cell for the error message; nothing is appended
+            for cell in cells:
+                try:
+                    pack(0x2, 4, *cell)
+                except struct.error:
+                    raise self._invalid_data_error(cell) from None
+            raise
+        self.data += packed
     
     def draw_line(self, x1: int, y1: int, x2: int, y2: int, color: int, char: int):
         """Add draw line command"""
-        self.add_command(0x3, [x1, y1, x2, y2, color, char])
+        self._append_packed(_DRAW_LINE, 0x3, 6, x1, y1, x2, y2, color, char)
+    
+    def draw_hrun(self, x: int, y: int, count: int, color: int, char: int):
+        """Add a horizontal run of count identical characters as a single command"""
+        if count == 1:
+            self.draw_character(x, y, color, char)
+        elif count > 1:
+            self.draw_line(x, y, x + count - 1, y, color, char)
+    
+    def draw_vrun(self, x: int, y: int, count: int, color: int, char: int):
+        """Add a vertical run of count identical characters as a single command"""
+        if count == 1:
+            self.draw_character(x, y, color, char)
+        elif count > 1:
+            self.draw_line(x, y, x, y + count - 1, color, char)
     
     def render_text(self, x: int, y: int, color: int, text: str):
         """Add render text command"""
         text_bytes = text.encode('ascii', errors='replace')
-        data = [x, y, color] + list(text_bytes)
-        self.add_command(0x4, data)
+        try:
+            header = _RENDER_TEXT_HEADER.pack(0x4, 3 + len(text_bytes), x, y, color)
+        except struct.error:
+            raise self._invalid_data_error((x, y, color, *text_bytes)) from None
+        self.data += header
+        self.data += text_bytes
+    
+    def render_texts(self, rows: Iterable[Tuple[int, int, int, str]]):
+        """Add a render text command for every (x, y, color, text) row in one bulk extend"""
+        header = _RENDER_TEXT_HEADER.pack
+        parts = []
+        for x, y, color, text in rows:
+            text_bytes = text.encode('ascii', errors='replace')
+            try:
+                parts.append(header(0x4, 3 + len(text_bytes), x, y, color))
+            except struct.error:
+                # Nothing is appended when any row can't be encoded
+                raise self._invalid_data_error((x, y, color, *text_bytes)) from None
+            parts.append(text_bytes)
+        self.data += b''.join(parts)
     
     def cursor_movement(self, x: int, y: int):
         """Add cursor movement command"""
-        self.add_command(0x5, [x, y])
+        self._append_packed(_TWO_BYTE_COMMAND, 0x5, 2, x, y)
     
     def draw_at_cursor(self, char: int, color: int):
         """Add draw at cursor command"""
-        self.add_command(0x6, [char, color])
+        self._append_packed(_TWO_BYTE_COMMAND, 0x6, 2, char, color)
     
     def clear_screen(self):
         """Add clear screen command"""
-        self.add_command(0x7, [])
+        self.data += b'\x07\x00'
     
     def end_of_file(self):
         """Add end of file command"""
-        self.add_command(0xFF, [])
+        self.data += b'\xff\x00'
     
     def get_data(self) -> bytes:
         """Get the complete binary data"""
         return bytes(self.data)
 
 
+@lru_cache(maxsize=1)
 def create_demo_1() -> bytes:
     """Create a simple demo with text and shapes"""
     builder = BinaryCommandBuilder()
@@ -108,6 +189,7 @@ def create_demo_1() -> bytes:
     return builder.get_data()
 
 
+@lru_cache(maxsize=1)
 def create_demo_2() -> bytes:
     """Create a more complex demo with animations"""
     builder = BinaryCommandBuilder()
@@ -119,16 +201,14 @@ def create_demo_2() -> bytes:
     # Title
     builder.render_text(20, 1, 14, "Pattern Demo")
     
-    # Create a checkerboard pattern
-    for y in range(5, 15):
-        for x in range(10, 50):
-            if (x + y) % 2 == 0:
-                color = 8
-                char = ord('#')
-            else:
-                color = 15
-                char = ord('.')
-            builder.draw_character(x, y, color, char)
+    # Create a checkerboard pattern, packed in a single bulk extend
+    dark_cell = (8, ord('#'))
+    light_cell = (15, ord('.'))
+    builder.draw_characters(
+        (x, y) + (dark_cell if (x + y) % 2 == 0 else light_cell)
+        for y in range(5, 15)
+        for x in range(10, 50)
+    )
     
     # Draw border around pattern
     builder.draw_line(9, 4, 50, 4, 12, ord('='))
@@ -165,7 +245,7 @@ def main():
         sys.exit(1)
     
     # Output binary data
-    sys.stdout.buffer.write(data)
+    write_binary_output(data)
 
 
 if __name__ == "__main__":
@@ -60,14 +60,14 @@ def run_demo(command: str) -> bool:
                 gen_cmd = parts[0].split()
                 render_cmd = parts[1].split()
                 
-                # Run generator
+                # Run generator; its stderr is inherited so an unread pipe
+                # can never fill up and stall the pipeline
                 gen_process = subprocess.Popen(
                     [sys.executable] + gen_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
+                    stdout=subprocess.PIPE
                 )
                 
-                # Run renderer
+                # Run renderer, streaming the generator output straight in
                 render_process = subprocess.Popen(
                     [sys.executable] + render_cmd,
                     stdin=gen_process.stdout,
@@ -75,20 +75,19 @@ def run_demo(command: str) -> bool:
                 )
                 
                 gen_process.stdout.close()
-                render_process.wait()
+                _, stderr = render_process.communicate()
+                gen_process.wait()
                 
                 if render_process.returncode != 0:
-                    stderr = render_process.stderr.read().decode()
-                    print(f"Error: {stderr}")
+                    print(f"Error: {stderr.decode(errors='replace')}")
+                    return False
+                if gen_process.returncode != 0:
                     return False
             else:
-                # Direct command
-                result = subprocess.run([sys.executable] + command.split(), capture_output=True, text=True)
-                if result.returncode != 0:
-                    print(f"Error: {result.stderr}")
+                # Direct command - inherit stdout so output streams as it is produced
+                direct_result = subprocess.run([sys.executable] + command.split())
+                if direct_result.returncode != 0:
                     return False
-                else:
-                    print(result.stdout)
         else:
             # Non-rendering command (benchmarks, tests)
             result = subprocess.run([sys.executable] + command.split(), text=True)
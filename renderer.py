@@ -7,11 +7,10 @@ Compatible with WebContainer Python environment
 
 import sys
 import os
-from typing import List, Optional, Tuple
-import traceback
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 from utils import (
-    create_mock_curses, MockScreen, safe_curses_operation, 
-    validate_command_data, clamp, BatchRenderer
+    create_mock_curses, MockScreen, safe_curses_operation, clamp, BatchRenderer
 )
 
 # Try to import curses, but provide fallback for WebContainer
@@ -22,18 +21,66 @@ except ImportError:
     CURSES_AVAILABLE = False
     curses = create_mock_curses()
 
+# Command payloads: memoryview slices from streams, bytearrays built by
+# coalesce_character_runs, or plain lists of ints
+CommandData = Union[bytes, bytearray, memoryview, List[int]]
+
+# Cell shadow value for a cell whose contents are unknown; never a real cell
+_EMPTY_CELL = array('Q', [2 ** 64 - 1])
+
+# Commands that modify the display and so need a refresh
+DISPLAY_COMMANDS = frozenset((0x1, 0x2, 0x3, 0x4, 0x6, 0x7))
+
+# Refresh at least this often during long streams to keep them interactive
+REFRESH_INTERVAL = 4096
+
+
 class ScreenRenderer:
     """Main renderer class that handles binary command processing"""
     
+    # Fixed slots make the state read on every draw a field access rather than
+    # a dict lookup. __dict__ is kept so methods can still be replaced per
+    # instance, as the tests do with patch.object.
+    __slots__ = (
+        'screen', 'color_pairs_initialized', '_attr_cache', '_color_count',
+        '_pair_limit', 'width', 'height', 'color_mode', 'cursor_x', 'cursor_y',
+        'initialized', '_cells', '__dict__'
+    )
+    
+    # Handler method for each command byte, looked up once per command
+    # instead of walking an if/elif chain. Names rather than bound methods
+    # keep handlers patchable on an instance.
+    _COMMAND_HANDLERS = {
+        0x1: '_cmd_screen_setup',
+        0x2: '_cmd_draw_character',
+        0x3: '_cmd_draw_line',
+        0x4: '_cmd_render_text',
+        0x5: '_cmd_cursor_movement',
+        0x6: '_cmd_draw_at_cursor',
+        0x7: '_cmd_clear_screen',
+    }
+    
     def __init__(self):
         self.screen = None
+        self.color_pairs_initialized = False
+        # Memoized color_pair() results; color pairs outlive a single stream
+        self._attr_cache = {}
+        # Colors that get a pair initialized on first use, set by _init_color_pairs
+        self._color_count = 0
+        self._pair_limit = 0
+        self.reset()
+    
+    def reset(self):
+        """Reset stream state so a new stream can be processed on the same screen"""
         self.width = 0
         self.height = 0
         self.color_mode = 0
         self.cursor_x = 0
         self.cursor_y = 0
         self.initialized = False
-        self.color_pairs_initialized = False
+        # Last character and attribute drawn in each cell, at y * width + x.
+        # A C array keeps this to 8 bytes per cell even on large screens.
+        self._cells = array('Q')
         
     def init_screen(self):
         """Initialize the curses screen with proper error handling"""
@@ -64,18 +111,16 @@ class ScreenRenderer:
                 self.color_pairs_initialized = True
     
     def _init_color_pairs(self):
-        """Initialize color pairs based on terminal capabilities"""
+        """Record available color pairs; each pair is initialized on first use"""
         try:
             max_colors = min(curses.COLORS, 256)
             max_pairs = min(curses.COLOR_PAIRS - 1, 255)
             
-            for i in range(1, min(max_colors, max_pairs + 1)):
-                try:
-                    curses.init_pair(i, i % max_colors, -1)
-                except curses.error:
-                    # Some terminals don't support all color combinations
-                    pass
-                    
+            # Pairs below this limit get init_pair() lazily in _compute_color_attr,
+            # so startup skips up to 255 init_pair calls and unused colors never pay
+            self._color_count = max_colors
+            self._pair_limit = min(max_colors, max_pairs + 1)
+            
             self.color_pairs_initialized = True
         except Exception:
             # Fallback to basic colors if advanced color initialization fails
@@ -98,10 +143,21 @@ class ScreenRenderer:
                 pass
     
     def _safe_addch(self, y: int, x: int, char: int, attr: int = 0):
-        """Safely add character with bounds checking"""
+        """Safely add character with bounds checking, skipping unchanged cells"""
         try:
             if 0 <= y < self.height and 0 <= x < self.width:
+                # Overwrite-heavy streams redraw the same cells; only send changes
+                cells = self._cells
+                index = y * self.width + x
+                if index >= len(cells):
+                    # No shadow until screen setup sizes it
+                    self.screen.addch(y, x, char, attr)
+                    return
+                cell = attr << 8 | char
+                if cells[index] == cell:
+                    return
                 self.screen.addch(y, x, char, attr)
+                cells[index] = cell
         except curses.error:
             # Ignore errors from drawing at invalid positions
             pass
@@ -114,58 +170,102 @@ class ScreenRenderer:
                 max_len = self.width - x
                 if len(text) > max_len:
                     text = text[:max_len]
+                
+                self._forget_cells(y, x, len(text))
                 self.screen.addstr(y, x, text, attr)
         except curses.error:
             pass
     
+    def _safe_hline(self, y: int, x: int, char: int, count: int, attr: int = 0):
+        """Safely draw a run of one character with a single curses call"""
+        try:
+            if 0 <= y < self.height and 0 <= x < self.width:
+                # hline never wraps, but keep the shadow cells within the row
+                count = min(count, self.width - x)
+                self._forget_cells(y, x, count)
+                self.screen.hline(y, x, char | attr, count)
+        except curses.error:
+            pass
+    
+    def _safe_vline(self, y: int, x: int, char: int, count: int, attr: int = 0):
+        """Safely draw a column of one character with a single curses call"""
+        try:
+            if 0 <= y < self.height and 0 <= x < self.width:
+                # Clip to the bottom edge, as per-cell drawing would
+                count = min(count, self.height - y)
+                self._forget_cells(y, x, count, self.width)
+                self.screen.vline(y, x, char | attr, count)
+        except curses.error:
+            pass
+    
+    def _forget_cells(self, y: int, x: int, count: int, step: int = 1):
+        """Drop shadowed cells that a multi-cell draw is about to overwrite
+        
+        step is the distance between cells: 1 for a row, the screen width
+        for a column.
+        """
+        start = y * self.width + x
+        stop = start + count * step
+        if stop - step < len(self._cells):
+            self._cells[start:stop:step] = _EMPTY_CELL * count
+    
+    def _reset_cells(self):
+        """Size the cell shadow to the screen with every cell unknown"""
+        self._cells = _EMPTY_CELL * (self.width * self.height)
+    
     def _get_color_attr(self, color: int) -> int:
         """Get color attribute, with fallback for unsupported colors"""
         if not self.color_pairs_initialized or color == 0:
             return 0
         
+        attr = self._attr_cache.get(color)
+        if attr is None:
+            attr = self._attr_cache[color] = self._compute_color_attr(color)
+        return attr
+    
+    def _compute_color_attr(self, color: int) -> int:
+        """Look up the curses attribute for a color, clamped to the available pairs"""
         # Clamp color to available range
         max_color = min(curses.COLOR_PAIRS - 1, 255)
         color = max(1, min(color, max_color))
         
+        if color < self._pair_limit:
+            try:
+                curses.init_pair(color, color % self._color_count, -1)
+            except curses.error:
+                # Some terminals don't support all color combinations
+                pass
+        
         try:
             return curses.color_pair(color)
         except:
             return 0
     
-    def process_command(self, command: int, length: int, data: List[int]) -> bool:
+    def process_command(self, command: int, length: int, data: CommandData) -> bool:
         """Process a single command from the binary stream"""
         # Only allow screen setup before initialization
         if command != 0x1 and not self.initialized:
             return True
         
+        if command == 0xFF:  # End of file
+            return False
+        
+        handler_name = self._COMMAND_HANDLERS.get(command)
+        if handler_name is None:
+            # Unknown command, continue processing
+            return True
+        
         try:
-            if command == 0x1:  # Screen setup
-                return self._cmd_screen_setup(data)
-            elif command == 0x2:  # Draw character
-                return self._cmd_draw_character(data)
-            elif command == 0x3:  # Draw line
-                return self._cmd_draw_line(data)
-            elif command == 0x4:  # Render text
-                return self._cmd_render_text(data)
-            elif command == 0x5:  # Cursor movement
-                return self._cmd_cursor_movement(data)
-            elif command == 0x6:  # Draw at cursor
-                return self._cmd_draw_at_cursor(data)
-            elif command == 0x7:  # Clear screen
-                return self._cmd_clear_screen(data)
-            elif command == 0xFF:  # End of file
-                return False
-            else:
-                # Unknown command, continue processing
-                return True
-                
+            return getattr(self, handler_name)(data)
         except Exception as e:
             # Log error but continue processing
             return True
     
-    def _cmd_screen_setup(self, data: List[int]) -> bool:
+    def _cmd_screen_setup(self, data: CommandData) -> bool:
         """Handle screen setup command"""
-        if not validate_command_data(data, 3):
+        # Length checks are inlined in every handler: a call to
+        # validate_command_data costs more than the comparison itself
+        if len(data) < 3:
             return True
             
         self.width = data[0]
@@ -177,14 +277,15 @@ class ScreenRenderer:
             return True
             
         safe_curses_operation(getattr(self.screen, 'resize', lambda h, w: None), self.height, self.width)
+        self._reset_cells()
             
         self.initialized = True
         safe_curses_operation(self.screen.refresh)
         return True
     
-    def _cmd_draw_character(self, data: List[int]) -> bool:
+    def _cmd_draw_character(self, data: CommandData) -> bool:
         """Handle draw character command"""
-        if not validate_command_data(data, 4):
+        if len(data) < 4:
             return True
             
         x, y, color, char = data[:4]
@@ -192,9 +293,9 @@ class ScreenRenderer:
         self._safe_addch(y, x, char, attr)
         return True
     
-    def _cmd_draw_line(self, data: List[int]) -> bool:
+    def _cmd_draw_line(self, data: CommandData) -> bool:
         """Handle draw line command"""
-        if not validate_command_data(data, 6):
+        if len(data) < 6:
             return True
             
         x1, y1, x2, y2, color, char = data[:6]
@@ -202,23 +303,23 @@ class ScreenRenderer:
         self._draw_line(x1, y1, x2, y2, char, attr)
         return True
     
-    def _cmd_render_text(self, data: List[int]) -> bool:
+    def _cmd_render_text(self, data: CommandData) -> bool:
         """Handle render text command"""
-        if not validate_command_data(data, 3):
+        if len(data) < 3:
             return True
             
         x, y, color = data[:3]
-        try:
-            text = bytes(data[3:]).decode('ascii', errors='replace')
-            attr = self._get_color_attr(color)
-            self._safe_addstr(y, x, text, attr)
-        except:
-            pass
+        # Latin-1 maps every byte straight to a code point, so decoding cannot
+        # fail and skips the error handler; _safe_addstr handles curses errors
+        # and anything else is caught once in process_command
+        text = bytes(data[3:]).decode('latin-1')
+        attr = self._get_color_attr(color)
+        self._safe_addstr(y, x, text, attr)
         return True
     
-    def _cmd_cursor_movement(self, data: List[int]) -> bool:
+    def _cmd_cursor_movement(self, data: CommandData) -> bool:
         """Handle cursor movement command"""
-        if not validate_command_data(data, 2):
+        if len(data) < 2:
             return True
             
         self.cursor_x, self.cursor_y = data[:2]
@@ -226,12 +327,18 @@ class ScreenRenderer:
         self.cursor_x = clamp(self.cursor_x, 0, self.width - 1)
         self.cursor_y = clamp(self.cursor_y, 0, self.height - 1)
         
-        safe_curses_operation(self.screen.move, self.cursor_y, self.cursor_x)
+        # Called directly rather than through safe_curses_operation, whose
+        # *args packing costs several times the move itself on cursor-heavy
+        # streams
+        try:
+            self.screen.move(self.cursor_y, self.cursor_x)
+        except curses.error:
+            pass
         return True
     
-    def _cmd_draw_at_cursor(self, data: List[int]) -> bool:
+    def _cmd_draw_at_cursor(self, data: CommandData) -> bool:
         """Handle draw at cursor command"""
-        if not validate_command_data(data, 2):
+        if len(data) < 2:
             return True
             
         char, color = data[:2]
@@ -239,14 +346,31 @@ class ScreenRenderer:
         self._safe_addch(self.cursor_y, self.cursor_x, char, attr)
         return True
     
-    def _cmd_clear_screen(self, data: List[int]) -> bool:
+    def _cmd_clear_screen(self, data: CommandData) -> bool:
         """Handle clear screen command"""
-        safe_curses_operation(self.screen.clear)
-        safe_curses_operation(self.screen.refresh)
+        # erase() only blanks the window, so the next refresh sends just the
+        # cells redrawn afterwards; clear() would force a full repaint. The
+        # refresh itself is left to the stream's batched flush.
+        safe_curses_operation(self.screen.erase)
+        self._reset_cells()
         return True
     
     def _draw_line(self, x1: int, y1: int, x2: int, y2: int, char: int, attr: int):
         """Draw line using Bresenham's algorithm"""
+        if y1 == y2:
+            # Horizontal lines are one contiguous run, so draw them in one call
+            self._safe_hline(y1, min(x1, x2), char, abs(x2 - x1) + 1, attr)
+            return
+        
+        if x1 == x2:
+            # Vertical lines are one column run, likewise a single call
+            self._safe_vline(min(y1, y2), x1, char, abs(y2 - y1) + 1, attr)
+            return
+        
+        # Bresenham walk that emits each run of points sharing a row (or a
+        # column, for steep lines) as one hline/vline call; single points,
+        # as on near-diagonal lines, still go through addch
+        addch = self._safe_addch
         dx = abs(x2 - x1)
         dy = abs(y2 - y1)
         x, y = x1, y1
@@ -254,25 +378,106 @@ class ScreenRenderer:
         sy = 1 if y1 < y2 else -1
         
         if dx > dy:
+            hline = self._safe_hline
             err = dx // 2
+            start = x
             while x != x2:
-                self._safe_addch(y, x, char, attr)
                 err -= dy
                 if err < 0:
+                    if start == x:
+                        addch(y, x, char, attr)
+                    else:
+                        hline(y, min(start, x), char, abs(x - start) + 1, attr)
                     y += sy
                     err += dx
+                    start = x + sx
                 x += sx
+            if start == x:
+                addch(y, x, char, attr)
+            else:
+                hline(y, min(start, x), char, abs(x - start) + 1, attr)
         else:
+            vline = self._safe_vline
             err = dy // 2
+            start = y
             while y != y2:
-                self._safe_addch(y, x, char, attr)
                 err -= dx
                 if err < 0:
+                    if start == y:
+                        addch(y, x, char, attr)
+                    else:
+                        vline(min(start, y), x, char, abs(y - start) + 1, attr)
                     x += sx
                     err += dy
+                    start = y + sy
                 y += sy
+            if start == y:
+                addch(y, x, char, attr)
+            else:
+                vline(min(start, y), x, char, abs(y - start) + 1, attr)
+
+
+def iter_commands(data: bytes) -> Iterator[Tuple[int, int, memoryview]]:
+    """Decode a binary stream into (command, length, data) tuples
+    
+    Decoding stops at the first truncated command. Each payload is a
+    zero-copy memoryview slice of the stream; indexing it yields ints.
+    """
+    view = memoryview(data)
+    i = 0
+    n = len(data)
+    
+    # Each command needs at least its command and length bytes
+    while i + 1 < n:
+        length = data[i + 1]
+        end = i + 2 + length
         
-        self._safe_addch(y, x, char, attr)
+        # Validate length to prevent buffer overflow
+        if end > n:
+            return
+        
+        yield data[i], length, view[i + 2:end]
+        i = end
+
+
+def _character_run_command(run: bytearray) -> Tuple[int, int, bytearray]:
+    """Turn a pending character run back into a command tuple"""
+    if len(run) == 4:
+        return 0x2, 4, run
+    return 0x4, len(run), run
+
+
+def coalesce_character_runs(commands: Iterable[Tuple[int, int, CommandData]]
+                            ) -> Iterator[Tuple[int, int, CommandData]]:
+    """Merge consecutive draw_character commands on one row into render_text
+    
+    Characters with the same row and color at contiguous columns become a
+    single render_text command, so the renderer issues one addstr instead of
+    an addch per cell. Only printable ASCII is merged, since addch and addstr
+    render higher bytes differently; every other command passes through
+    unchanged.
+    """
+    run = None  # bytearray laid out as a render_text payload: x, y, color, chars
+    
+    for command, length, data in commands:
+        if command == 0x2 and length == 4 and 32 <= data[3] < 127:
+            x, y, color, char = data[0], data[1], data[2], data[3]
+            if (run is not None and y == run[1] and color == run[2]
+                    and x == run[0] + len(run) - 3 and len(run) < 255):
+                run.append(char)
+                continue
+            if run is not None:
+                yield _character_run_command(run)
+            run = bytearray((x, y, color, char))
+            continue
+        
+        if run is not None:
+            yield _character_run_command(run)
+            run = None
+        yield command, length, data
+    
+    if run is not None:
+        yield _character_run_command(run)
 
 
 def process_binary_stream(data: bytes) -> None:
@@ -286,29 +491,15 @@ def process_binary_stream(data: bytes) -> None:
     
     try:
         renderer.init_screen()
-        i = 0
         
         # Use batched rendering to reduce refresh calls
-        with BatchRenderer(renderer.screen) as batch:
-            while i < len(data):
-                if i + 1 >= len(data):
-                    break
-                    
-                command = data[i]
-                length = data[i + 1]
-                
-                # Validate length to prevent buffer overflow
-                if i + 2 + length > len(data):
-                    break
-                    
-                command_data = list(data[i + 2:i + 2 + length])
-                i += 2 + length
-                
+        with BatchRenderer(renderer.screen, REFRESH_INTERVAL) as batch:
+            for command, length, command_data in coalesce_character_runs(iter_commands(data)):
                 if not renderer.process_command(command, length, command_data):
                     break
                 
                 # Mark screen as dirty for batched refresh
-                if command in [0x1, 0x2, 0x3, 0x4, 0x6, 0x7]:  # Commands that modify display
+                if command in DISPLAY_COMMANDS:
                     batch.mark_dirty()
         
         # Wait for user input before exiting (skip in WebContainer)
@@ -325,6 +516,8 @@ def process_binary_stream(data: bytes) -> None:
         renderer.cleanup()
         print(f"Error: {e}", file=sys.stderr)
         if CURSES_AVAILABLE:
+            # Only needed on failure, so keep it off the startup path
+            import traceback
             traceback.print_exc()
         sys.exit(1)
     finally:
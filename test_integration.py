@@ -4,27 +4,35 @@ Integration tests for the terminal screen renderer
 Tests the complete workflow from demo generation to rendering
 """
 import unittest
-import tempfile
+import hashlib
+import io
 import os
 import sys
-import subprocess
 from unittest.mock import patch, Mock
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from renderer import ScreenRenderer, process_binary_stream, main
+from renderer import ScreenRenderer, process_binary_stream, iter_commands, main
 from demo import BinaryCommandBuilder, create_demo_1, create_demo_2, main as demo_main
+from showcase_demos import (
+    create_game_of_life, create_data_visualization_demo, create_ascii_art_showcase
+)
 from utils import run_test_suite_with_summary
 
 
 class TestFullIntegration(unittest.TestCase):
     """Full integration tests combining all components"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Generate the demo streams once for every test in the class"""
+        cls.demo1 = create_demo_1()
+        cls.demo2 = create_demo_2()
+    
     def test_demo_to_renderer_pipeline(self):
         """Test complete pipeline from demo generation to screen rendering"""
-        # Generate demo data
-        demo_data = create_demo_1()
+        demo_data = self.demo1
         
         # Process with renderer
         renderer = ScreenRenderer()
@@ -33,27 +41,14 @@ class TestFullIntegration(unittest.TestCase):
         # Mock the init to avoid curses dependency
         with patch.object(renderer, 'init_screen'):
             # Parse and process all commands
-            i = 0
             commands_processed = []
             
-            while i < len(demo_data) - 1:
-                if i + 1 >= len(demo_data):
-                    break
-                    
-                command = demo_data[i]
-                length = demo_data[i + 1]
-                
-                if i + 2 + length > len(demo_data):
-                    break
-                    
-                command_data = list(demo_data[i + 2:i + 2 + length])
+            for command, length, command_data in iter_commands(demo_data):
                 result = renderer.process_command(command, length, command_data)
                 commands_processed.append(command)
                 
                 if not result:  # EOF
                     break
-                    
-                i += 2 + length
         
         # Verify we processed multiple commands including setup and EOF
         self.assertIn(0x1, commands_processed)  # Screen setup
@@ -63,52 +58,92 @@ class TestFullIntegration(unittest.TestCase):
     
     def test_file_io_integration(self):
         """Test file input/output integration"""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            # Write demo data to temporary file
-            demo_data = create_demo_2()
-            tmp.write(demo_data)
-            tmp.flush()
-            
-            # Test reading from file
-            with patch('renderer.process_binary_stream') as mock_process:
-                with patch('sys.argv', ['renderer.py', tmp.name]):
-                    main()
-                
-                mock_process.assert_called_once()
-                # Verify the data passed matches what we wrote
-                called_data = mock_process.call_args[0][0]
-                self.assertEqual(called_data, demo_data)
+        demo_data = self.demo2
+        
+        # Serve the file from memory; only the renderer module's open is replaced
+        with patch('renderer.open', create=True, return_value=io.BytesIO(demo_data)) as mock_open, \
+             patch('renderer.process_binary_stream') as mock_process, \
+             patch('sys.argv', ['renderer.py', 'demo.bin']):
+            main()
         
-        # Clean up
-        os.unlink(tmp.name)
+        mock_open.assert_called_once_with('demo.bin', 'rb')
+        mock_process.assert_called_once()
+        # Verify the data passed matches what was read
+        called_data = mock_process.call_args[0][0]
+        self.assertEqual(called_data, demo_data)
+    
+    def _run_demo_main(self, demo_type: str):
+        """Run demo main with stdout on descriptor 1, returning the (fd, bytes) writes"""
+        writes = []
+        
+        def fake_write(fd, data):
+            writes.append((fd, bytes(data)))
+            return len(data)
+        
+        with patch('sys.argv', ['demo.py', demo_type]), \
+             patch('sys.stdout') as mock_stdout, \
+             patch('utils.os.write', side_effect=fake_write):
+            mock_stdout.fileno.return_value = 1
+            demo_main()
+        
+        return writes
     
     def test_demo_main_function(self):
         """Test demo main function with different parameters"""
-        # Test demo 1
+        for demo_type, expected in (('1', self.demo1), ('2', self.demo2)):
+            with self.subTest(demo=demo_type):
+                writes = self._run_demo_main(demo_type)
+                
+                # Should have written binary data straight to the stdout descriptor
+                self.assertTrue(writes)
+                self.assertTrue(all(fd == 1 for fd, _ in writes))
+                written_data = b''.join(data for _, data in writes)
+                self.assertEqual(written_data, expected)
+                self.assertGreater(len(written_data), 0)
+    
+    def test_demo_main_without_file_descriptor(self):
+        """Test demo main falls back to the buffer when stdout has no descriptor"""
         with patch('sys.argv', ['demo.py', '1']), \
              patch('sys.stdout') as mock_stdout:
             
+            mock_stdout.fileno.side_effect = io.UnsupportedOperation("fileno")
             mock_buffer = Mock()
             mock_stdout.buffer = mock_buffer
             
             demo_main()
             
-            # Should have written binary data
             self.assertTrue(mock_buffer.write.called)
             written_data = mock_buffer.write.call_args[0][0]
             self.assertIsInstance(written_data, bytes)
             self.assertGreater(len(written_data), 0)
+    
+    def test_showcase_demos_render(self):
+        """Test showcase demos build and render, with their streams pinned"""
+        expected_digests = {
+            create_game_of_life:
+                '1fa1457653c1a8ebf7c0124955a5a4c0a9345ae07faa23017ada7d2068e96636',
+            create_data_visualization_demo:
+                '961132cc36db54dc7b7a82cd7e585014349a65b49e11f52f97f2a88eb605866c',
+            create_ascii_art_showcase:
+                '0e19d0f210c24195c880ee1d16caa3d66e2143cf9192217a5bf05cf2ab7c90ca',
+        }
         
-        # Test demo 2
-        with patch('sys.argv', ['demo.py', '2']), \
-             patch('sys.stdout') as mock_stdout:
-            
-            mock_buffer = Mock()
-            mock_stdout.buffer = mock_buffer
-            
-            demo_main()
-            
-            self.assertTrue(mock_buffer.write.called)
+        for demo_func, digest in expected_digests.items():
+            with self.subTest(demo=demo_func.__name__):
+                demo_data = demo_func()
+                self.assertEqual(hashlib.sha256(demo_data).hexdigest(), digest)
+                
+                renderer = ScreenRenderer()
+                renderer.screen = Mock()
+                commands = [command for command, _, _ in iter_commands(demo_data)]
+                for command, length, command_data in iter_commands(demo_data):
+                    if not renderer.process_command(command, length, command_data):
+                        break
+                
+                self.assertEqual(commands[0], 0x1)
+                self.assertEqual(commands[-1], 0xFF)
+                self.assertTrue(renderer.initialized)
+                self.assertTrue(renderer.screen.hline.called)
 
 
 def run_integration_tests():
@@ -4,19 +4,21 @@ Comprehensive test suite for the terminal screen renderer
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import Mock, patch, MagicMock, call, DEFAULT
 import sys
 import os
 import io
+import random
 import tempfile
 import struct
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from renderer import ScreenRenderer, process_binary_stream
+from renderer import ScreenRenderer, process_binary_stream, iter_commands, coalesce_character_runs
 from demo import BinaryCommandBuilder, create_demo_1, create_demo_2
-from utils import run_test_suite_with_summary
+from showcase_demos import _life_step
+from utils import run_test_suite_with_summary, BatchRenderer
 
 
 class TestBinaryCommandBuilder(unittest.TestCase):
@@ -61,15 +63,59 @@ class TestBinaryCommandBuilder(unittest.TestCase):
         expected = bytes([0x2, 4, 10, 5, 12, ord('A')])
         self.assertEqual(data, expected)
     
+    def test_draw_characters_bulk(self):
+        """Test bulk draw characters matches individual draw_character calls"""
+        cells = [(0, 0, 1, ord('A')), (5, 3, 9, ord('#')), (79, 23, 15, ord('.'))]
+        self.builder.draw_characters(cells)
+        
+        individual = BinaryCommandBuilder()
+        for cell in cells:
+            individual.draw_character(*cell)
+        
+        self.assertEqual(self.builder.get_data(), individual.get_data())
+        
+        with self.assertRaises(ValueError):
+            self.builder.draw_characters([(0, 0, 1, 9608)])
+    
+    def test_render_texts_bulk(self):
+        """Test bulk render texts matches individual render_text calls"""
+        rows = [(0, 0, 7, "Hello"), (10, 5, 12, "World!"), (0, 23, 1, "")]
+        self.builder.render_texts(rows)
+        
+        individual = BinaryCommandBuilder()
+        for row in rows:
+            individual.render_text(*row)
+        
+        self.assertEqual(self.builder.get_data(), individual.get_data())
+        
+        with self.assertRaises(ValueError):
+            self.builder.render_texts([(0, 0, 7, "ok"), (0, 0, 7, "x" * 253)])
+        self.assertEqual(self.builder.get_data(), individual.get_data())  # Nothing appended
+    
+    def test_draw_runs(self):
+        """Test horizontal and vertical runs encode as a single command"""
+        self.builder.draw_hrun(10, 5, 4, 2, ord('='))
+        self.builder.draw_vrun(3, 1, 3, 7, ord('|'))
+        self.builder.draw_hrun(0, 0, 1, 1, ord('x'))
+        self.builder.draw_vrun(0, 0, 0, 1, ord('x'))  # Empty run adds nothing
+        
+        expected = BinaryCommandBuilder()
+        expected.draw_line(10, 5, 13, 5, 2, ord('='))
+        expected.draw_line(3, 1, 3, 3, 7, ord('|'))
+        expected.draw_character(0, 0, 1, ord('x'))
+        
+        self.assertEqual(self.builder.get_data(), expected.get_data())
+    
     def test_draw_character_special_chars(self):
         """Test draw character with special characters"""
         special_chars = [0, 32, 127, 255]  # null, space, DEL, extended
         for char in special_chars:
-            builder = BinaryCommandBuilder()
-            builder.draw_character(0, 0, 1, char)
-            data = builder.get_data()
-            expected = bytes([0x2, 4, 0, 0, 1, char])
-            self.assertEqual(data, expected)
+            with self.subTest(char=char):
+                builder = BinaryCommandBuilder()
+                builder.draw_character(0, 0, 1, char)
+                data = builder.get_data()
+                expected = bytes([0x2, 4, 0, 0, 1, char])
+                self.assertEqual(data, expected)
     
     def test_draw_line(self):
         """Test draw line command generation"""
@@ -182,6 +228,27 @@ class TestBinaryCommandBuilder(unittest.TestCase):
         
         expected = bytes([0x88, 0])
         self.assertEqual(data, expected)
+    
+    def test_add_command_rejects_int_data(self):
+        """Test add_command raises for a bare int instead of emitting zero bytes"""
+        with self.assertRaises(TypeError):
+            self.builder.add_command(0x2, 5)
+        
+        self.assertEqual(self.builder.get_data(), b'')
+    
+    def test_invalid_data_values(self):
+        """Test that out-of-range or non-integer values raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.builder.add_command(0x99, [1, 256])
+        with self.assertRaises(ValueError):
+            self.builder.add_command(0x99, [1.5])
+        with self.assertRaises(ValueError):
+            self.builder.draw_character(-1, 0, 1, ord('A'))
+        with self.assertRaises(ValueError):
+            self.builder.render_text(0, 0, 1, "A" * 300)
+        
+        # Nothing should be written for rejected commands
+        self.assertEqual(self.builder.get_data(), b'')
 
 
 class TestScreenRenderer(unittest.TestCase):
@@ -202,34 +269,46 @@ class TestScreenRenderer(unittest.TestCase):
         self.assertEqual(renderer.cursor_y, 0)
         self.assertFalse(renderer.color_pairs_initialized)
     
+    def test_reset(self):
+        """Test reset clears stream state but keeps the screen"""
+        self.renderer._cmd_screen_setup([80, 24, 2])
+        self.renderer._cmd_cursor_movement([10, 5])
+        self.renderer.color_pairs_initialized = True
+        
+        self.renderer.reset()
+        
+        self.assertFalse(self.renderer.initialized)
+        self.assertEqual(self.renderer.width, 0)
+        self.assertEqual(self.renderer.height, 0)
+        self.assertEqual(self.renderer.cursor_x, 0)
+        self.assertEqual(self.renderer.cursor_y, 0)
+        self.assertIs(self.renderer.screen, self.mock_screen)
+        self.assertTrue(self.renderer.color_pairs_initialized)
+    
     @patch('renderer.CURSES_AVAILABLE', True)
-    @patch('renderer.curses.initscr')
-    @patch('renderer.curses.start_color')
-    @patch('renderer.curses.use_default_colors')
-    @patch('renderer.curses.noecho')
-    @patch('renderer.curses.cbreak')
-    @patch('renderer.curses.curs_set')
-    @patch('renderer.curses.has_colors')
-    def test_init_screen_success(self, mock_has_colors, mock_curs_set, 
-                                mock_cbreak, mock_noecho, mock_use_default,
-                                mock_start_color, mock_initscr):
+    def test_init_screen_success(self):
         """Test successful screen initialization"""
         mock_screen = Mock()
-        mock_initscr.return_value = mock_screen
-        mock_has_colors.return_value = True
-        
-        renderer = ScreenRenderer()
         
-        with patch.object(renderer, '_init_color_pairs'):
-            renderer.init_screen()
+        # One patcher for every curses entry point init_screen touches
+        with patch.multiple('renderer.curses', initscr=DEFAULT, start_color=DEFAULT,
+                            use_default_colors=DEFAULT, noecho=DEFAULT, cbreak=DEFAULT,
+                            curs_set=DEFAULT, has_colors=DEFAULT) as mocks:
+            mocks['initscr'].return_value = mock_screen
+            mocks['has_colors'].return_value = True
+            
+            renderer = ScreenRenderer()
+            
+            with patch.object(renderer, '_init_color_pairs'):
+                renderer.init_screen()
         
         self.assertEqual(renderer.screen, mock_screen)
-        mock_initscr.assert_called_once()
-        mock_start_color.assert_called_once()
-        mock_use_default.assert_called_once()
-        mock_noecho.assert_called_once()
-        mock_cbreak.assert_called_once()
-        mock_curs_set.assert_called_once_with(0)
+        mocks['initscr'].assert_called_once()
+        mocks['start_color'].assert_called_once()
+        mocks['use_default_colors'].assert_called_once()
+        mocks['noecho'].assert_called_once()
+        mocks['cbreak'].assert_called_once()
+        mocks['curs_set'].assert_called_once_with(0)
     
     @patch('renderer.CURSES_AVAILABLE', True)
     @patch('renderer.curses.initscr')
@@ -248,10 +327,14 @@ class TestScreenRenderer(unittest.TestCase):
     def test_init_color_pairs(self, mock_init_pair):
         """Test color pairs initialization"""
         self.renderer._init_color_pairs()
-        
-        # Should initialize color pairs 1-255
-        self.assertTrue(mock_init_pair.called)
         self.assertTrue(self.renderer.color_pairs_initialized)
+        
+        # Pairs are initialized the first time each color is used
+        mock_init_pair.assert_not_called()
+        with patch('renderer.curses.color_pair', return_value=42):
+            self.renderer._get_color_attr(5)
+            self.renderer._get_color_attr(5)
+        mock_init_pair.assert_called_once_with(5, 5, -1)
     
     @patch('renderer.curses.init_pair')
     def test_init_color_pairs_with_errors(self, mock_init_pair):
@@ -261,6 +344,7 @@ class TestScreenRenderer(unittest.TestCase):
         
         # Should not raise exception
         self.renderer._init_color_pairs()
+        self.renderer._get_color_attr(5)
     
     def test_cleanup(self):
         """Test cleanup method"""
@@ -291,13 +375,12 @@ class TestScreenRenderer(unittest.TestCase):
         self.renderer.height = 24
         
         # Out of bounds coordinates
-        self.renderer._safe_addch(-1, 20, ord('A'), 0)
-        self.renderer._safe_addch(10, -1, ord('A'), 0)
-        self.renderer._safe_addch(25, 20, ord('A'), 0)
-        self.renderer._safe_addch(10, 85, ord('A'), 0)
-        
-        # Should not call addch for any of these
-        self.mock_screen.addch.assert_not_called()
+        for y, x in ((-1, 20), (10, -1), (25, 20), (10, 85)):
+            with self.subTest(coords=(y, x)):
+                self.renderer._safe_addch(y, x, ord('A'), 0)
+                
+                # Should not call addch for any of these
+                self.mock_screen.addch.assert_not_called()
     
     def test_safe_addch_curses_error(self):
         """Test safe_addch handling curses errors"""
@@ -309,6 +392,22 @@ class TestScreenRenderer(unittest.TestCase):
         # Should not raise exception
         self.renderer._safe_addch(10, 20, ord('A'), 0)
     
+    def test_safe_addch_skips_unchanged_cells(self):
+        """Test redrawing an unchanged cell does not call addch again"""
+        self.renderer._cmd_screen_setup([80, 24, 1])
+        
+        self.renderer._safe_addch(10, 20, ord('A'), 0)
+        self.renderer._safe_addch(10, 20, ord('A'), 0)
+        self.assertEqual(self.mock_screen.addch.call_count, 1)
+        
+        # A different attribute, overwriting text or a clear all force a redraw
+        self.renderer._safe_addch(10, 20, ord('A'), 5)
+        self.renderer._safe_addstr(10, 18, "xyz", 0)
+        self.renderer._safe_addch(10, 20, ord('A'), 5)
+        self.renderer._cmd_clear_screen([])
+        self.renderer._safe_addch(10, 20, ord('A'), 5)
+        self.assertEqual(self.mock_screen.addch.call_count, 4)
+    
     def test_safe_addstr_valid(self):
         """Test safe_addstr with valid coordinates"""
         self.renderer.width = 80
@@ -329,6 +428,31 @@ class TestScreenRenderer(unittest.TestCase):
         expected_text = long_text[:5]  # 30 - 25 = 5 characters
         self.mock_screen.addstr.assert_called_once_with(10, 25, expected_text, 0)
     
+    def test_safe_hline_truncation(self):
+        """Test safe_hline draws one run clipped to the screen width"""
+        self.renderer.width = 30
+        self.renderer.height = 24
+        
+        self.renderer._safe_hline(10, 25, ord('='), 20, 256)
+        self.renderer._safe_hline(24, 0, ord('='), 5, 0)  # Off screen
+        
+        self.mock_screen.hline.assert_called_once_with(10, 25, ord('=') | 256, 5)
+    
+    def test_safe_vline_truncation(self):
+        """Test safe_vline draws one column clipped to the screen height"""
+        self.renderer._cmd_screen_setup([30, 24, 1])
+        self.renderer._safe_addch(22, 4, ord('A'), 0)
+        
+        self.renderer._safe_vline(20, 4, ord('|'), 10, 256)
+        self.renderer._safe_vline(0, 30, ord('|'), 5, 0)  # Off screen
+        
+        self.mock_screen.vline.assert_called_once_with(20, 4, ord('|') | 256, 4)
+        
+        # The overwritten cell is forgotten, so redrawing it isn't skipped
+        self.mock_screen.addch.reset_mock()
+        self.renderer._safe_addch(22, 4, ord('A'), 0)
+        self.mock_screen.addch.assert_called_once()
+    
     def test_get_color_attr(self):
         """Test color attribute generation"""
         self.renderer.color_pairs_initialized = True
@@ -340,6 +464,19 @@ class TestScreenRenderer(unittest.TestCase):
             self.assertEqual(attr, 42)
             mock_color_pair.assert_called_once_with(5)
     
+    def test_get_color_attr_memoized(self):
+        """Test color attributes are looked up once per color"""
+        self.renderer.color_pairs_initialized = True
+        
+        # COLOR_PAIRS only exists once initscr() has run, so create it here
+        with patch('renderer.curses.COLOR_PAIRS', 256, create=True), \
+             patch('renderer.curses.color_pair') as mock_color_pair:
+            mock_color_pair.return_value = 42
+            
+            for _ in range(3):
+                self.assertEqual(self.renderer._get_color_attr(5), 42)
+            mock_color_pair.assert_called_once_with(5)
+    
     def test_get_color_attr_fallback(self):
         """Test color attribute fallback"""
         self.renderer.color_pairs_initialized = False
@@ -417,6 +554,16 @@ class TestScreenRenderer(unittest.TestCase):
             self.assertTrue(result)
             mock_addstr.assert_called_once_with(10, 5, "Hello", 7)
     
+    def test_render_text_high_bytes(self):
+        """Test render text maps bytes above ASCII to Latin-1 characters"""
+        self.renderer.initialized = True
+        
+        with patch.object(self.renderer, '_safe_addstr') as mock_addstr:
+            result = self.renderer._cmd_render_text(memoryview(bytes([5, 10, 0, 0x43, 0xE9])))
+            
+            self.assertTrue(result)
+            mock_addstr.assert_called_once_with(10, 5, "C\u00e9", 0)
+    
     def test_cursor_movement_command(self):
         """Test cursor movement command"""
         self.renderer.initialized = True
@@ -466,30 +613,38 @@ class TestScreenRenderer(unittest.TestCase):
         result = self.renderer._cmd_clear_screen([])
         
         self.assertTrue(result)
-        self.mock_screen.clear.assert_called_once()
-        self.mock_screen.refresh.assert_called()
+        self.mock_screen.erase.assert_called_once()
+        self.mock_screen.clear.assert_not_called()
+        self.mock_screen.refresh.assert_not_called()
     
     def test_draw_line_algorithm(self):
         """Test line drawing algorithm"""
         self.renderer.width = 80
         self.renderer.height = 24
         
-        with patch.object(self.renderer, '_safe_addch') as mock_addch:
-            # Test horizontal line
-            self.renderer._draw_line(0, 5, 10, 5, ord('-'), 0)
-            self.assertEqual(mock_addch.call_count, 11)  # 0 to 10 inclusive
-            
-            mock_addch.reset_mock()
-            
-            # Test vertical line
-            self.renderer._draw_line(5, 0, 5, 10, ord('|'), 0)
-            self.assertEqual(mock_addch.call_count, 11)  # 0 to 10 inclusive
+        with patch.object(self.renderer, '_safe_addch') as mock_addch, \
+             patch.object(self.renderer, '_safe_hline') as mock_hline, \
+             patch.object(self.renderer, '_safe_vline') as mock_vline:
+            # Test horizontal line, drawn as a single run
+            self.renderer._draw_line(10, 5, 0, 5, ord('-'), 0)
+            mock_hline.assert_called_once_with(5, 0, ord('-'), 11, 0)  # 0 to 10 inclusive
+            mock_addch.assert_not_called()
             
-            mock_addch.reset_mock()
+            # Test vertical line, also a single run
+            self.renderer._draw_line(5, 10, 5, 0, ord('|'), 0)
+            mock_vline.assert_called_once_with(0, 5, ord('|'), 11, 0)  # 0 to 10 inclusive
+            mock_addch.assert_not_called()
             
             # Test diagonal line
             self.renderer._draw_line(0, 0, 5, 5, ord('\\'), 0)
             self.assertEqual(mock_addch.call_count, 6)  # 0 to 5 inclusive
+            
+            # Test shallow line, drawn as one run per row
+            mock_hline.reset_mock()
+            self.renderer._draw_line(0, 0, 9, 1, ord('-'), 0)
+            self.assertEqual(mock_hline.call_args_list,
+                             [call(0, 0, ord('-'), 5, 0), call(1, 5, ord('-'), 5, 0)])
+            self.assertEqual(mock_addch.call_count, 6)  # Unchanged by the runs
     
     def test_process_command_before_setup(self):
         """Test that commands are ignored before screen setup"""
@@ -518,6 +673,19 @@ class TestScreenRenderer(unittest.TestCase):
         with patch.object(self.renderer, '_cmd_draw_character', side_effect=Exception("Test error")):
             result = self.renderer.process_command(0x2, 4, [10, 10, 1, ord('A')])
             self.assertTrue(result)  # Should continue despite error
+    
+    def test_process_command_memoryview_data(self):
+        """Test that command data can be a zero-copy memoryview slice"""
+        view = memoryview(bytes([80, 24, 2, 10, 5, 3, ord('A'), 2, 3, 7]) + b"Hi")
+        
+        self.renderer.process_command(0x1, 3, view[0:3])
+        self.renderer.process_command(0x2, 4, view[3:7])
+        self.renderer.process_command(0x4, 5, view[7:12])
+        
+        self.assertTrue(self.renderer.initialized)
+        self.assertEqual(self.renderer.width, 80)
+        self.mock_screen.addch.assert_called_once_with(5, 10, ord('A'), 0)
+        self.mock_screen.addstr.assert_called_once_with(3, 2, "Hi", 0)
 
 
 class TestDemoGeneration(unittest.TestCase):
@@ -549,30 +717,62 @@ class TestDemoGeneration(unittest.TestCase):
         # Should end with EOF
         self.assertEqual(data[-2], 0xFF)
     
+    def test_demo_generation_cached(self):
+        """Test repeated demo generation reuses the cached bytes"""
+        self.assertIs(create_demo_1(), create_demo_1())
+        self.assertEqual(create_demo_1.__wrapped__(), create_demo_1())
+    
     def test_demo_data_structure(self):
         """Test that demo data has valid structure"""
         data = create_demo_1()
         
-        i = 0
-        commands_found = []
+        commands = list(iter_commands(data))
+        commands_found = [command for command, _, _ in commands]
         
-        while i < len(data) - 1:
-            command = data[i]
-            length = data[i + 1]
-            
-            commands_found.append(command)
-            
-            # Validate length doesn't exceed remaining data
-            self.assertLessEqual(i + 2 + length, len(data))
-            
-            i += 2 + length
-            
-            if command == 0xFF:  # EOF
-                break
+        # Every command fits in the stream, with no truncated tail
+        self.assertEqual(sum(2 + length for _, length, _ in commands), len(data))
         
         # Should contain screen setup and EOF
         self.assertIn(0x1, commands_found)
         self.assertIn(0xFF, commands_found)
+    
+    def test_life_step_matches_neighbor_count(self):
+        """Test the bitmask Game of Life step against counting neighbors cell by cell"""
+        def naive_step(rows, width):
+            height = len(rows)
+            
+            def alive(x, y):
+                return 0 <= x < width and 0 <= y < height and rows[y] >> x & 1
+            
+            new_rows = []
+            for y in range(height):
+                row = 0
+                for x in range(width):
+                    neighbors = sum(alive(x + dx, y + dy)
+                                    for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+                    if neighbors == 3 or (neighbors == 2 and alive(x, y)):
+                        row |= 1 << x
+                new_rows.append(row)
+            return new_rows
+        
+        rng = random.Random(1234)
+        grids = [
+            (5, [0b11111] * 5),  # Full grid, every edge live
+            (6, [0b111111, 0b100001, 0b100001, 0b111111]),  # Border only
+            (3, [0b101]),  # Single row
+            (1, [1, 1, 1]),  # Single column
+        ]
+        for _ in range(50):
+            width, height = rng.randint(1, 40), rng.randint(1, 20)
+            grids.append((width, [rng.getrandbits(width) for _ in range(height)]))
+        
+        for width, rows in grids:
+            with self.subTest(width=width, rows=rows):
+                # Several generations, so patterns grow into the edges
+                for _ in range(4):
+                    expected = naive_step(rows, width)
+                    self.assertEqual(_life_step(rows, width), expected)
+                    rows = expected
 
 
 class TestBinaryStreamProcessing(unittest.TestCase):
@@ -618,6 +818,55 @@ class TestBinaryStreamProcessing(unittest.TestCase):
         mock_renderer.init_screen.assert_called_once()
         mock_renderer.cleanup.assert_called_once()
     
+    def test_iter_commands(self):
+        """Test stream decoding stops at a truncated command"""
+        builder = BinaryCommandBuilder()
+        builder.screen_setup(40, 20, 1)
+        builder.render_text(1, 2, 3, "Hi")
+        builder.end_of_file()
+        data = builder.get_data() + bytes([0x2, 4, 1])
+        
+        commands = list(iter_commands(data))
+        
+        self.assertEqual(commands, [
+            (0x1, 3, bytes([40, 20, 1])),
+            (0x4, 5, bytes([1, 2, 3]) + b"Hi"),
+            (0xFF, 0, b""),
+        ])
+    
+    def test_coalesce_character_runs(self):
+        """Test contiguous characters on a row merge into render_text"""
+        builder = BinaryCommandBuilder()
+        builder.draw_character(5, 2, 1, ord('a'))
+        builder.draw_character(6, 2, 1, ord('b'))
+        builder.draw_character(7, 2, 1, ord('c'))
+        builder.draw_character(9, 2, 1, ord('d'))  # Gap in columns
+        builder.draw_character(10, 2, 2, ord('e'))  # Color change
+        builder.draw_character(11, 2, 2, 200)  # Not printable ASCII
+        builder.end_of_file()
+        
+        commands = [(command, length, bytes(data)) for command, length, data
+                    in coalesce_character_runs(iter_commands(builder.get_data()))]
+        
+        self.assertEqual(commands, [
+            (0x4, 6, bytes([5, 2, 1]) + b"abc"),
+            (0x2, 4, bytes([9, 2, 1, ord('d')])),
+            (0x2, 4, bytes([10, 2, 2, ord('e')])),
+            (0x2, 4, bytes([11, 2, 2, 200])),
+            (0xFF, 0, b""),
+        ])
+    
+    def test_batch_renderer_flush_interval(self):
+        """Test batched rendering refreshes once per interval and at exit"""
+        screen = Mock()
+        
+        with BatchRenderer(screen, flush_interval=3) as batch:
+            for _ in range(7):
+                batch.mark_dirty()
+            self.assertEqual(screen.refresh.call_count, 2)
+        
+        self.assertEqual(screen.refresh.call_count, 3)
+    
     @patch('renderer.ScreenRenderer')
     def test_process_binary_stream_keyboard_interrupt(self, mock_renderer_class):
         """Test handling keyboard interrupt"""
@@ -649,6 +898,22 @@ class TestMainFunction(unittest.TestCase):
         
         mock_process.assert_called_once_with(test_data)
     
+    @patch('sys.argv', ['renderer.py'])
+    @patch('renderer.process_binary_stream')
+    def test_main_stdin_pipe(self, mock_process):
+        """Test main function reading a whole stream from a real stdin pipe"""
+        data = create_demo_2()
+        read_fd, write_fd = os.pipe()
+        # The demo fits in the pipe buffer, so it can be written up front
+        os.write(write_fd, data)
+        os.close(write_fd)
+        
+        with os.fdopen(read_fd, 'rb') as pipe, patch('sys.stdin', Mock(buffer=pipe)):
+            from renderer import main
+            main()
+        
+        mock_process.assert_called_once_with(data)
+    
     @patch('sys.argv', ['renderer.py', 'test.bin'])
     @patch('builtins.open', create=True)
     @patch('renderer.process_binary_stream')
@@ -694,33 +959,28 @@ class TestMainFunction(unittest.TestCase):
 class TestIntegration(unittest.TestCase):
     """Integration tests combining multiple components"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Generate and frame demo 1 once for the class"""
+        cls.demo1 = create_demo_1()
+        cls.demo1_commands = list(iter_commands(cls.demo1))
+    
     def test_full_demo_pipeline(self):
         """Test complete pipeline from demo generation to processing"""
-        # Generate demo data
-        data = create_demo_1()
+        data = self.demo1
         
         # Verify data structure
         self.assertTrue(len(data) > 10)
         self.assertEqual(data[0], 0x1)  # Screen setup
         
-        # Parse and verify commands
-        i = 0
-        command_count = 0
+        # Verify the parsed commands
+        commands = self.demo1_commands
         
-        while i < len(data) - 1:
-            command = data[i]
-            length = data[i + 1]
-            
-            # Validate command structure
-            self.assertLessEqual(i + 2 + length, len(data))
-            
-            command_count += 1
-            i += 2 + length
-            
-            if command == 0xFF:
-                break
+        # Validate command structure: the stream frames exactly, ending at EOF
+        self.assertEqual(sum(2 + length for _, length, _ in commands), len(data))
+        self.assertEqual(commands[-1][0], 0xFF)
         
-        self.assertGreater(command_count, 5)  # Should have multiple commands
+        self.assertGreater(len(commands), 5)  # Should have multiple commands
     
     def test_builder_renderer_compatibility(self):
         """Test that builder output is compatible with renderer"""
@@ -740,14 +1000,9 @@ class TestIntegration(unittest.TestCase):
         renderer = ScreenRenderer()
         renderer.screen = Mock()
         
-        i = 0
         processed_commands = 0
         
-        while i < len(data) - 1:
-            command = data[i]
-            length = data[i + 1]
-            command_data = list(data[i + 2:i + 2 + length])
-            
+        for command, length, command_data in iter_commands(data):
             result = renderer.process_command(command, length, command_data)
             
             if command == 0xFF:
@@ -755,8 +1010,6 @@ class TestIntegration(unittest.TestCase):
                 break
             else:
                 processed_commands += 1
-            
-            i += 2 + length
         
         self.assertGreater(processed_commands, 5)
         self.assertTrue(renderer.initialized)
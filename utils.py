@@ -3,9 +3,9 @@
 Utility functions and classes to reduce code redundancy across the project
 """
 
+import os
 import sys
 import time
-import unittest
 from typing import List, Callable, Any
 from contextlib import contextmanager
 
@@ -56,6 +56,11 @@ def create_mock_curses():
 class MockScreen:
     """Mock screen implementation"""
     
+    __slots__ = ('width', 'height')
+    
+    # Key code returned by getch, computed once
+    _QUIT_KEY = ord('q')
+    
     def __init__(self):
         self.width = 80
         self.height = 24
@@ -69,9 +74,18 @@ class MockScreen:
     def addstr(self, y, x, text, attr=0):
         pass
     
+    def hline(self, y, x, ch, n):
+        pass
+    
+    def vline(self, y, x, ch, n):
+        pass
+    
     def clear(self):
         pass
     
+    def erase(self):
+        pass
+    
     def refresh(self):
         pass
     
@@ -79,7 +93,7 @@ class MockScreen:
         pass
     
     def getch(self):
-        return ord('q')  # Simulate quit key
+        return self._QUIT_KEY  # Simulate quit key
     
     def resize(self, height, width):
         self.height = height
@@ -108,6 +122,25 @@ def safe_curses_operation(operation: Callable, *args, **kwargs) -> Any:
         return None
 
 
+def write_binary_output(data: bytes) -> None:
+    """Write binary data straight to the stdout file descriptor, bypassing BufferedWriter"""
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # stdout has no real descriptor (e.g. WebContainer or an in-memory stream)
+        sys.stdout.buffer.write(data)
+        return
+    
+    # Flush anything already buffered so output stays in order
+    sys.stdout.flush()
+    
+    # os.write may write less than requested to a pipe, so loop until done
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
 def validate_command_data(data: List[int], min_length: int) -> bool:
     """Validate command data has minimum required length"""
     return len(data) >= min_length
@@ -115,11 +148,20 @@ def validate_command_data(data: List[int], min_length: int) -> bool:
 
 def clamp(value: int, min_val: int, max_val: int) -> int:
     """Clamp a value between min and max bounds"""
-    return max(min_val, min(value, max_val))
+    # Plain comparisons avoid two builtin calls per cursor move; min_val
+    # still wins when the bounds cross, as with max(min_val, min(...))
+    if value > max_val:
+        value = max_val
+    if value < min_val:
+        value = min_val
+    return value
 
 
 def run_test_suite_with_summary(test_classes: List[type], suite_name: str) -> bool:
     """Run a test suite and print summary"""
+    # Imported here so the renderer doesn't pay for unittest at startup
+    import unittest
+    
     print(f"Running {suite_name}...")
     print("=" * 60)
     
@@ -153,21 +195,34 @@ def run_test_suite_with_summary(test_classes: List[type], suite_name: str) -> bo
 
 
 class BatchRenderer:
-    """Helper class to batch screen refresh operations"""
+    """Helper class to batch screen refresh operations
+    
+    With flush_interval set, the screen is also refreshed after that many
+    dirty marks so long streams still show progress while drawing.
+    """
+    
+    __slots__ = ('screen', 'needs_refresh', 'flush_interval', 'pending')
     
-    def __init__(self, screen):
+    def __init__(self, screen, flush_interval: int = 0):
         self.screen = screen
         self.needs_refresh = False
+        self.flush_interval = flush_interval
+        self.pending = 0
     
     def mark_dirty(self):
         """Mark that screen needs refresh"""
         self.needs_refresh = True
+        if self.flush_interval:
+            self.pending += 1
+            if self.pending >= self.flush_interval:
+                self.flush()
     
     def flush(self):
         """Refresh screen if needed"""
         if self.needs_refresh and self.screen:
             safe_curses_operation(self.screen.refresh)
             self.needs_refresh = False
+        self.pending = 0
     
     def __enter__(self):
         return self